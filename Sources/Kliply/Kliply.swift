@@ -1,10 +1,6 @@
 import SwiftUI
 import AppKit
 
-extension Notification.Name {
-    static let hidePopup = Notification.Name("hidePopup")
-}
-
 @main
 struct KliplyApp: App {
     @State private var appState = AppState.shared
@@ -30,8 +26,9 @@ struct KliplyApp: App {
 
 @MainActor
 class AppDelegate: NSObject, NSApplicationDelegate {
+    /// Built on first show and reused afterwards; hiding only orders it out
     var popupWindow: NSWindow?
-    private var windowLevelTimer: Timer?
+    private var isPopupShown = false
     private var lastFrontmostApp: NSRunningApplication?
     
     func applicationDidFinishLaunching(_ notification: Notification) {
@@ -41,9 +38,12 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         // Hide from Dock
         NSApp.setActivationPolicy(.accessory)
         
-        // Register for Services menu
+        // Register for Services menu; refreshing the services list is slow and
+        // not needed for the first hotkey press, so let launch finish first
         NSApp.servicesProvider = self
-        NSUpdateDynamicServices()
+        DispatchQueue.main.async {
+            NSUpdateDynamicServices()
+        }
         
         // Monitor for popup visibility changes
         setupPopupMonitoring()
@@ -56,17 +56,6 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         #if DEBUG
         print("applicationDidFinishLaunching: App started")
         #endif
-        
-        // Observe hidePopup notification
-        NotificationCenter.default.addObserver(
-            forName: .hidePopup,
-            object: nil,
-            queue: .main
-        ) { [weak self] _ in
-            Task { @MainActor in
-                self?.hidePopup()
-            }
-        }
     }
     
     private func setupAppActivationTracking() {
@@ -130,41 +119,43 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         AppState.shared.stop()
     }
     
+    /// Shows or hides the popup whenever `isPopupVisible` changes, without polling
     private func setupPopupMonitoring() {
-        Timer.scheduledTimer(withTimeInterval: 0.1, repeats: true) { [weak self] timer in
-            guard self != nil else {
-                timer.invalidate()
-                return
-            }
-            
+        withObservationTracking {
+            _ = AppState.shared.isPopupVisible
+        } onChange: { [weak self] in
+            // onChange fires before the new value is stored, so sync on the next turn
             Task { @MainActor [weak self] in
                 guard let self = self else { return }
-                let shouldShow = AppState.shared.isPopupVisible
-                
-                if shouldShow && self.popupWindow == nil {
-                    self.showPopup()
-                } else if !shouldShow && self.popupWindow != nil {
-                    self.hidePopup()
-                }
+                self.syncPopupWindow()
+                self.setupPopupMonitoring()
             }
         }
     }
     
+    private func syncPopupWindow() {
+        let shouldShow = AppState.shared.isPopupVisible
+        
+        if shouldShow && !isPopupShown {
+            showPopup()
+        } else if !shouldShow && isPopupShown {
+            hidePopup()
+        }
+    }
+    
+    /// Floats Settings windows as they become key, instead of polling every window
     private func setupWindowLevelMonitoring() {
-        windowLevelTimer = Timer.scheduledTimer(withTimeInterval: 0.5, repeats: true) { [weak self] timer in
-            guard self != nil else {
-                timer.invalidate()
-                return
-            }
-            
-            Task { @MainActor in
-                // Find and update all Settings windows
-                for window in NSApplication.shared.windows {
-                    // Check if this is a Settings window by looking for typical settings window characteristics
-                    if window.title.contains("Settings") || window.title.contains("Preferences") {
-                        if window.level != .floating {
-                            window.level = .floating
-                        }
+        NotificationCenter.default.addObserver(
+            forName: NSWindow.didBecomeKeyNotification,
+            object: nil,
+            queue: .main
+        ) { notification in
+            guard let window = notification.object as? NSWindow else { return }
+            MainActor.assumeIsolated {
+                // Check if this is a Settings window by looking for typical settings window characteristics
+                if window.title.contains("Settings") || window.title.contains("Preferences") {
+                    if window.level != .floating {
+                        window.level = .floating
                     }
                 }
             }
@@ -176,24 +167,7 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         #if DEBUG
         print("=== showPopup() called ===")
         #endif
-        let contentView = PopupWindow()
-            .environment(AppState.shared)
-        
-        let hostingController = NSHostingController(rootView: contentView)
-        
-        // Create a normal window that will activate
-        let window = NSWindow(contentViewController: hostingController)
-        window.styleMask = [.titled, .closable, .fullSizeContentView]
-        window.titlebarAppearsTransparent = true
-        window.titleVisibility = .hidden
-        window.isMovableByWindowBackground = true
-        window.backgroundColor = NSColor.windowBackgroundColor
-        window.isOpaque = true
-        
-        // Appear above fullscreen apps
-        window.level = NSWindow.Level(rawValue: Int(CGWindowLevelForKey(.screenSaverWindow)) - 1)
-        window.collectionBehavior = [.canJoinAllSpaces, .fullScreenAuxiliary, .stationary, .ignoresCycle]
-        window.hidesOnDeactivate = false
+        let window = popupWindow ?? makePopupWindow()
         
         // Center on the screen where the mouse currently is
         let mouseLocation = NSEvent.mouseLocation
@@ -208,6 +182,7 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         }
         
         self.popupWindow = window
+        isPopupShown = true
         
         // Show and activate
         window.makeKeyAndOrderFront(nil)
@@ -218,25 +193,44 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         
     }
     
+    private func makePopupWindow() -> NSWindow {
+        let contentView = PopupWindow()
+            .environment(AppState.shared)
+        
+        let hostingController = NSHostingController(rootView: contentView)
+        
+        // Create a normal window that will activate
+        let window = NSWindow(contentViewController: hostingController)
+        window.styleMask = [.titled, .closable, .fullSizeContentView]
+        window.titlebarAppearsTransparent = true
+        window.titleVisibility = .hidden
+        window.isMovableByWindowBackground = true
+        window.backgroundColor = NSColor.windowBackgroundColor
+        window.isOpaque = true
+        // Kept for reuse, so closing must not release it
+        window.isReleasedWhenClosed = false
+        
+        // Appear above fullscreen apps
+        window.level = NSWindow.Level(rawValue: Int(CGWindowLevelForKey(.screenSaverWindow)) - 1)
+        window.collectionBehavior = [.canJoinAllSpaces, .fullScreenAuxiliary, .stationary, .ignoresCycle]
+        window.hidesOnDeactivate = false
+        return window
+    }
+    
     @MainActor
     private func hidePopup() {
         #if DEBUG
         print("hidePopup: Closing window")
         #endif
-        popupWindow?.close()
-        popupWindow = nil
+        popupWindow?.orderOut(nil)
+        isPopupShown = false
         NSApp.deactivate()
         #if DEBUG
         print("hidePopup: previousApp = \(AppState.shared.getPreviousAppName())")
         print("hidePopup: Deactivating Kliply")
         #endif
         AppState.shared.restoreFocusToPreviousApp()
-        DispatchQueue.main.asyncAfter(deadline: .now() + 0.05) {
-            #if DEBUG
-            print("hidePopup: Restoring focus immediately")
-            #endif
-            AppState.shared.restoreFocusToPreviousApp()
-        }
+        // Activating the previous app directly normally takes; retry only if we are still active
         DispatchQueue.main.asyncAfter(deadline: .now() + 0.2) {
             #if DEBUG
             print("hidePopup: Second focus restore attempt")
@@ -5,20 +5,26 @@ import Carbon
 /// Application settings and preferences
 @Observable
 @MainActor
-class AppSettings {
+final class AppSettings {
     static let shared = AppSettings()
     
     // History settings
     var historyDepth: Int = 10 {
         didSet {
-            if historyDepth < 1 { historyDepth = 1 }
-            if historyDepth > 100 { historyDepth = 100 }
+            let clamped = min(max(historyDepth, 1), 100)
+            if clamped != historyDepth { historyDepth = clamped }
         }
     }
     
     // Hotkey settings
-    var hotkeyModifiers: UInt32 = UInt32(cmdKey | shiftKey) // Cmd+Shift
-    var hotkeyKeyCode: UInt32 = UInt32(kVK_ANSI_V) // V key
+    var hotkeyModifiers: UInt32 = UInt32(cmdKey | shiftKey) { // Cmd+Shift
+        didSet { updateHotkeyDescription() }
+    }
+    var hotkeyKeyCode: UInt32 = UInt32(kVK_ANSI_V) { // V key
+        didSet { updateHotkeyDescription() }
+    }
+    /// Display form of the hotkey, rebuilt only when the hotkey changes
+    private(set) var hotkeyDescription: String = ""
     
     // Paste behavior
     var alwaysPastePlainText: Bool = false
@@ -42,11 +48,16 @@ class AppSettings {
     // Exclusion settings
     private(set) var excludedApps: [String] = [] {
         didSet {
+            lowercasedExcludedApps = excludedApps.map { $0.lowercased() }
             UserDefaults.standard.set(excludedApps, forKey: "excludedApps")
         }
     }
+    /// `excludedApps` lowercased when the list changes, not on every clipboard check
+    @ObservationIgnored private(set) var lowercasedExcludedApps: [String] = []
     
     private init() {
+        updateHotkeyDescription()
+        
         // Check initial login item status
         Task { @MainActor in
             self.launchAtLogin = await LoginItemManager.shared.isEnabled()
@@ -55,26 +66,26 @@ class AppSettings {
         // Load excluded apps from UserDefaults
         if let saved = UserDefaults.standard.array(forKey: "excludedApps") as? [String] {
             self.excludedApps = saved
+            self.lowercasedExcludedApps = saved.map { $0.lowercased() }
         }
     }
     
     func isAppExcluded(bundleIdentifier: String) -> Bool {
-        excludedApps.contains(where: { excludedApp in
-            bundleIdentifier.lowercased().contains(excludedApp.lowercased()) ||
-            excludedApp.lowercased().contains(bundleIdentifier.lowercased())
+        let bundleIdentifier = bundleIdentifier.lowercased()
+        return lowercasedExcludedApps.contains(where: { excludedApp in
+            bundleIdentifier.contains(excludedApp) ||
+            excludedApp.contains(bundleIdentifier)
         })
     }
     
     func addExcludedApp(_ app: String) {
         if !excludedApps.contains(app) {
             excludedApps.append(app)
-            UserDefaults.standard.set(excludedApps, forKey: "excludedApps")
         }
     }
     
     func removeExcludedApp(_ app: String) {
         excludedApps.removeAll { $0 == app }
-        UserDefaults.standard.set(excludedApps, forKey: "excludedApps")
     }
     
     /// Detects commonly used password managers and sensitive apps installed on the system
@@ -113,65 +124,62 @@ class AppSettings {
         let fileManager = FileManager.default
         var detected: [String] = []
         
+        // Listed only if a bundle ID lookup misses, and then once for all app groups
+        let appDirs = ["/Applications", "\(NSHomeDirectory())/Applications"]
+        lazy var installedApps: [String] = appDirs.flatMap { dir in
+            ((try? fileManager.contentsOfDirectory(atPath: dir)) ?? []).filter { $0.hasSuffix(".app") }
+        }
+        
         for appGroup in sensitiveApps {
-            var found = false
-            
             // Try bundle ID lookup first
-            for bundleId in appGroup.bundleIds {
-                if workspace.urlForApplication(withBundleIdentifier: bundleId) != nil {
-                    detected.append(appGroup.displayName)
-                    found = true
-                    break
-                }
+            if appGroup.bundleIds.contains(where: { workspace.urlForApplication(withBundleIdentifier: $0) != nil }) {
+                detected.append(appGroup.displayName)
+                continue
             }
             
-            if found { continue }
-            
             // Try looking in common app directories
-            let appDirs = ["/Applications", "\(NSHomeDirectory())/Applications"]
-            for dir in appDirs {
-                if !fileManager.fileExists(atPath: dir) { continue }
-                
-                guard let contents = try? fileManager.contentsOfDirectory(atPath: dir) else { continue }
-                
-                for appName in appGroup.appNames {
-                    for content in contents {
-                        if content.contains(appName) && content.hasSuffix(".app") {
-                            detected.append(appGroup.displayName)
-                            found = true
-                            break
-                        }
-                    }
-                    if found { break }
-                }
-                if found { break }
+            let apps = installedApps
+            if appGroup.appNames.contains(where: { appName in apps.contains { $0.contains(appName) } }) {
+                detected.append(appGroup.displayName)
             }
         }
         
         return detected.sorted()
     }
     
-    var hotkeyDescription: String {
-        var modifiers: [String] = []
-        if hotkeyModifiers & UInt32(cmdKey) != 0 { modifiers.append("⌘") }
-        if hotkeyModifiers & UInt32(optionKey) != 0 { modifiers.append("⌥") }
-        if hotkeyModifiers & UInt32(controlKey) != 0 { modifiers.append("⌃") }
-        if hotkeyModifiers & UInt32(shiftKey) != 0 { modifiers.append("⇧") }
-        
-        let keyName = keyCodeToString(hotkeyKeyCode)
-        return modifiers.joined() + keyName
+    /// Carbon modifier masks and the symbols shown for them, in display order
+    private static let modifierSymbols: [(mask: UInt32, symbol: String)] = [
+        (UInt32(cmdKey), "⌘"),
+        (UInt32(optionKey), "⌥"),
+        (UInt32(controlKey), "⌃"),
+        (UInt32(shiftKey), "⇧")
+    ]
+    
+    private func updateHotkeyDescription() {
+        var description = ""
+        for (mask, symbol) in Self.modifierSymbols where hotkeyModifiers & mask != 0 {
+            description += symbol
+        }
+        hotkeyDescription = description + keyCodeToString(hotkeyKeyCode)
     }
     
+    /// Display names for the virtual key codes a shortcut can use, built once
+    private static let keyNames: [Int: String] = [
+        kVK_ANSI_A: "A", kVK_ANSI_B: "B", kVK_ANSI_C: "C", kVK_ANSI_D: "D", kVK_ANSI_E: "E",
+        kVK_ANSI_F: "F", kVK_ANSI_G: "G", kVK_ANSI_H: "H", kVK_ANSI_I: "I", kVK_ANSI_J: "J",
+        kVK_ANSI_K: "K", kVK_ANSI_L: "L", kVK_ANSI_M: "M", kVK_ANSI_N: "N", kVK_ANSI_O: "O",
+        kVK_ANSI_P: "P", kVK_ANSI_Q: "Q", kVK_ANSI_R: "R", kVK_ANSI_S: "S", kVK_ANSI_T: "T",
+        kVK_ANSI_U: "U", kVK_ANSI_V: "V", kVK_ANSI_W: "W", kVK_ANSI_X: "X", kVK_ANSI_Y: "Y",
+        kVK_ANSI_Z: "Z",
+        kVK_ANSI_0: "0", kVK_ANSI_1: "1", kVK_ANSI_2: "2", kVK_ANSI_3: "3", kVK_ANSI_4: "4",
+        kVK_ANSI_5: "5", kVK_ANSI_6: "6", kVK_ANSI_7: "7", kVK_ANSI_8: "8", kVK_ANSI_9: "9",
+        kVK_Space: "Space",
+        kVK_Return: "↩",
+        kVK_Escape: "⎋",
+        kVK_Tab: "⇥"
+    ]
+    
     private func keyCodeToString(_ keyCode: UInt32) -> String {
-        switch Int(keyCode) {
-        case kVK_ANSI_V: return "V"
-        case kVK_ANSI_C: return "C"
-        case kVK_ANSI_X: return "X"
-        case kVK_ANSI_A: return "A"
-        case kVK_Space: return "Space"
-        case kVK_Return: return "↩"
-        case kVK_Escape: return "⎋"
-        default: return "?"
-        }
+        Self.keyNames[Int(keyCode)] ?? "?"
     }
 }
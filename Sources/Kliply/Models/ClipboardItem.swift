@@ -6,20 +6,45 @@ struct ClipboardItem: Identifiable, Equatable {
     let id: UUID
     let timestamp: Date
     let content: ClipboardContent
+    /// Hash of `content.dedupKey`, computed once so history lookups never rehash stored items
+    let dedupHash: Int
+    /// Preview of `content`, built once at capture so rows and search never re-trim it
+    let previewText: String
     
     init(id: UUID = UUID(), timestamp: Date = Date(), content: ClipboardContent) {
         self.id = id
         self.timestamp = timestamp
         self.content = content
+        self.dedupHash = content.dedupKey.hashValue
+        self.previewText = content.previewText
+    }
+    
+    private init(id: UUID, timestamp: Date, content: ClipboardContent, dedupHash: Int, previewText: String) {
+        self.id = id
+        self.timestamp = timestamp
+        self.content = content
+        self.dedupHash = dedupHash
+        self.previewText = previewText
+    }
+    
+    /// The same entry with a fresh timestamp, sharing the stored content, hash and preview
+    func refreshed() -> ClipboardItem {
+        ClipboardItem(id: id, timestamp: Date(), content: content, dedupHash: dedupHash, previewText: previewText)
+    }
+    
+    /// Whether `other` is a re-copy of this entry, by dedup key rather than exact content
+    func isDuplicate(of other: ClipboardItem) -> Bool {
+        dedupHash == other.dedupHash && content.dedupKey == other.content.dedupKey
     }
     
     static func == (lhs: ClipboardItem, rhs: ClipboardItem) -> Bool {
-        lhs.content == rhs.content
+        // Equal content always has equal dedup keys, so the stored hash is a valid first check
+        lhs.dedupHash == rhs.dedupHash && lhs.content == rhs.content
     }
 }
 
 /// Different types of clipboard content
-enum ClipboardContent: Equatable {
+enum ClipboardContent: Hashable {
     case text(String)
     case richText(NSAttributedString)
     case image(NSImage)
@@ -34,7 +59,15 @@ enum ClipboardContent: Equatable {
         case (.richText(let a), .richText(let b)):
             return a.isEqual(to: b)
         case (.image(let a), .image(let b)):
-            return a.tiffRepresentation == b.tiffRepresentation
+            if a === b { return true }
+            switch (a.payloadDigest, b.payloadDigest) {
+            case let (digestA?, digestB?):
+                return digestA == digestB
+            case (nil, nil):
+                return a.size == b.size && a.bitmapData == b.bitmapData
+            default:
+                return false
+            }
         case (.url(let a, let titleA), .url(let b, let titleB)):
             return a == b && titleA == titleB
         case (.fileURLs(let a), .fileURLs(let b)):
@@ -46,6 +79,51 @@ enum ClipboardContent: Equatable {
         }
     }
     
+    func hash(into hasher: inout Hasher) {
+        switch self {
+        case .text(let str):
+            hasher.combine(0)
+            hasher.combine(str)
+        case .richText(let attr):
+            hasher.combine(1)
+            hasher.combine(attr.string)
+        case .image(let image):
+            hasher.combine(2)
+            // Images read by the monitor carry their payload digest, which tells
+            // same-size screenshots apart; others fall back to their dimensions
+            if let digest = image.payloadDigest {
+                hasher.combine(digest)
+            } else {
+                hasher.combine(image.size.width)
+                hasher.combine(image.size.height)
+            }
+        case .url(let url, let title):
+            hasher.combine(3)
+            hasher.combine(url)
+            hasher.combine(title)
+        case .fileURLs(let urls):
+            hasher.combine(4)
+            hasher.combine(urls)
+        case .unknown:
+            hasher.combine(5)
+        }
+    }
+    
+    /// What history dedup compares, as opposed to the exact content kept for pasting
+    enum DedupKey: Hashable {
+        case content(ClipboardContent)
+        case visibleText(String)
+    }
+    
+    /// Apps wrap the same copied text in different fonts and markup, so rich text
+    /// is keyed on its visible text only; everything else is keyed on itself
+    var dedupKey: DedupKey {
+        if case .richText(let attr) = self {
+            return .visibleText(attr.string)
+        }
+        return .content(self)
+    }
+    
     var displayType: String {
         switch self {
         case .text: return "Text"
@@ -79,3 +157,24 @@ enum ClipboardContent: Equatable {
         }
     }
 }
+
+extension NSImage {
+    /// Digest of the pasteboard bytes the image was decoded from, set by the clipboard monitor
+    var payloadDigest: Int? {
+        get { objc_getAssociatedObject(self, &payloadDigestKey) as? Int }
+        set { objc_setAssociatedObject(self, &payloadDigestKey, newValue, .OBJC_ASSOCIATION_RETAIN) }
+    }
+}
+
+nonisolated(unsafe) private var payloadDigestKey: UInt8 = 0
+
+private extension NSImage {
+    /// Raw pixel bytes of the image, read straight from its backing bitmap
+    /// instead of encoding a TIFF representation
+    var bitmapData: Data? {
+        guard let cgImage = cgImage(forProposedRect: nil, context: nil, hints: nil) else {
+            return tiffRepresentation
+        }
+        return cgImage.dataProvider?.data as Data?
+    }
+}
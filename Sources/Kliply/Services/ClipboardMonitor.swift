@@ -7,10 +7,29 @@ import AppKit
 class ClipboardMonitor {
     private var timer: Timer?
     private var lastChangeCount: Int = 0
+    @ObservationIgnored private var lastFingerprint: PasteboardFingerprint?
+    @ObservationIgnored private var lastPayloadDigest: Int?
+    @ObservationIgnored private var lastImageDigest: Int?
+    @ObservationIgnored private var lastImage: NSImage?
+    @ObservationIgnored private var imageTask: Task<Void, Never>?
     private let pasteboard = NSPasteboard.general
+    
+    /// Flavors NSImage(pasteboard:) can turn into an image, including file references
+    private static let imageReadableTypes: Set<NSPasteboard.PasteboardType> =
+        Set(NSImage.imageTypes.map { NSPasteboard.PasteboardType($0) }).union([.fileURL])
+    /// Image flavors whose bytes are decoded directly, in order of preference. PNG comes
+    /// first because history keeps these bytes, and pasteboard TIFF is usually uncompressed.
+    private static let rawImageTypes: [NSPasteboard.PasteboardType] = [.png, .tiff]
+    
+    /// Flavors the URL, file and text readers take their content from
+    private static let textualTypes: Set<NSPasteboard.PasteboardType> = [.string, .fileURL, .rtf, .html]
+    
+    /// Images larger than this are hashed off the main actor
+    private static let backgroundImageThreshold = 64 * 1024
     private weak var appSettings: AppSettings?
     
-    var onClipboardChange: ((ClipboardContent?) -> Void)?
+    /// Invoked on the main actor as soon as a change is read
+    var onClipboardChange: (@MainActor (ClipboardContent?) -> Void)?
     
     init(appSettings: AppSettings? = nil) {
         lastChangeCount = pasteboard.changeCount
@@ -19,89 +38,248 @@ class ClipboardMonitor {
     
     func startMonitoring() {
         timer = Timer.scheduledTimer(withTimeInterval: 0.5, repeats: true) { [weak self] _ in
-            Task { @MainActor [weak self] in
+            // Scheduled timers fire on the main run loop, so no Task hop is needed
+            MainActor.assumeIsolated {
                 self?.checkClipboard()
             }
         }
+        // Let the system batch our polls with other wakeups; a burst of pasteboard
+        // writes still lands in a single check thanks to the changeCount gate
+        timer?.tolerance = 0.1
     }
     
     func stopMonitoring() {
         timer?.invalidate()
         timer = nil
+        imageTask?.cancel()
+        imageTask = nil
     }
     
-    private func checkClipboard() {
-        guard pasteboard.changeCount != lastChangeCount else { return }
-        lastChangeCount = pasteboard.changeCount
+    func checkClipboard() {
+        let changeCount = pasteboard.changeCount
+        guard changeCount != lastChangeCount else { return }
+        lastChangeCount = changeCount
         
         // Check if the frontmost app is excluded
         if isFrontmostAppExcluded() {
             return
         }
         
-        let content = readClipboardContent()
+        // Look up the available flavors once; every reader below works from this list
+        let types = pasteboard.types ?? []
+        
+        // Fetch the captured flavors' bytes once; the dedup check and image reader share them
+        let payloads = capturedPayloads(types: types)
+        
+        // Re-copying identical content still bumps changeCount; bail before decoding it.
+        // A repeat needs a matching fingerprint and a matching full digest.
+        let fingerprint = PasteboardFingerprint(types: types, payloads: payloads)
+        let isRepeat = fingerprint == lastFingerprint
+        
+        // A raw image is always captured on its own, so it is the only payload
+        let image = payloads.first.flatMap { Self.rawImageTypes.contains($0.type) ? $0 : nil }
+        if let image, image.data.count > Self.backgroundImageThreshold {
+            // Hashing a large image happens off the main actor, even when it only confirms a repeat
+            let repeatedDigest = isRepeat ? lastPayloadDigest : nil
+            lastFingerprint = fingerprint
+            lastPayloadDigest = nil
+            imageTask?.cancel()
+            captureLargeImage(image, confirming: fingerprint, unlessDigest: repeatedDigest)
+            return
+        }
+        
+        let digest = Self.digest(of: payloads)
+        if isRepeat, digest == lastPayloadDigest {
+            return
+        }
+        lastFingerprint = fingerprint
+        lastPayloadDigest = digest
+        
+        // A newer copy supersedes any image still being hashed
+        imageTask?.cancel()
+        imageTask = nil
+        
+        let imageDigest = image == nil ? nil : digest
+        let content = readClipboardContent(types: Set(types), image: image, imageDigest: imageDigest)
         onClipboardChange?(content)
     }
     
+    /// Bytes of the flavors readClipboardContent takes its content from. The leading flavor is
+    /// often only a marker such as org.nspasteboard.source, so it says nothing about the content.
+    private func capturedPayloads(types: [NSPasteboard.PasteboardType]) -> [PasteboardPayload] {
+        let captured: [NSPasteboard.PasteboardType]
+        if let imageType = Self.rawImageTypes.first(where: types.contains) {
+            captured = [imageType]
+        } else {
+            captured = types.filter { Self.textualTypes.contains($0) || Self.imageReadableTypes.contains($0) }
+        }
+        return captured.compactMap { type in
+            pasteboard.data(forType: type).map { (data: $0, type: type) }
+        }
+    }
+    
+    /// Drop everything retained about the last capture, including its image, so nothing
+    /// cleared from history lingers here and the next copy is captured even if identical
+    func forgetLastCapture() {
+        lastFingerprint = nil
+        lastPayloadDigest = nil
+        lastImageDigest = nil
+        lastImage = nil
+    }
+    
     private func isFrontmostAppExcluded() -> Bool {
         guard let appSettings = appSettings else { return false }
         
         let workspace = NSWorkspace.shared
         guard let frontmostApp = workspace.frontmostApplication else { return false }
         
-        let bundleIdentifier = frontmostApp.bundleIdentifier ?? ""
-        let appName = frontmostApp.localizedName ?? ""
+        // Lowercase the frontmost app once rather than for every excluded entry
+        let bundleIdentifier = (frontmostApp.bundleIdentifier ?? "").lowercased()
+        let appName = (frontmostApp.localizedName ?? "").lowercased()
         
         // Check if either bundle ID or app name matches an excluded app
-        return appSettings.excludedApps.contains { excludedApp in
-            let excluded = excludedApp.lowercased()
-            return bundleIdentifier.lowercased().contains(excluded) ||
-                   excluded.contains(bundleIdentifier.lowercased()) ||
-                   appName.lowercased().contains(excluded) ||
-                   excluded.contains(appName.lowercased())
+        return appSettings.lowercasedExcludedApps.contains { excluded in
+            bundleIdentifier.contains(excluded) ||
+            excluded.contains(bundleIdentifier) ||
+            appName.contains(excluded) ||
+            excluded.contains(appName)
         }
     }
     
     func readClipboardContent() -> ClipboardContent? {
+        let types = pasteboard.types ?? []
+        return readClipboardContent(types: Set(types), image: rawImage(types: types))
+    }
+    
+    /// Reads the clipboard using flavors and raw image bytes the caller already fetched,
+    /// only touching the flavors that are present
+    private func readClipboardContent(
+        types: Set<NSPasteboard.PasteboardType>,
+        image rawImage: PasteboardPayload?,
+        imageDigest: Int? = nil
+    ) -> ClipboardContent? {
         // Check for images first
-        if let image = NSImage(pasteboard: pasteboard) {
+        if !types.isDisjoint(with: Self.imageReadableTypes),
+           let image = readImage(rawImage, digest: imageDigest) {
             return .image(image)
         }
         
+        // Read the string flavor once; the URL and plain text checks both use it
+        let string = types.contains(.string) ? pasteboard.string(forType: .string) : nil
+        
         // Check for URLs (http/https)
-        if let urlString = pasteboard.string(forType: .string),
+        if let urlString = string,
            let url = URL(string: urlString),
            (url.scheme == "http" || url.scheme == "https") {
             return .url(url, title: nil) // Title will be fetched later if needed
         }
         
         // Check for file URLs
-        if let fileURLs = pasteboard.readObjects(forClasses: [NSURL.self], options: nil) as? [URL],
+        if types.contains(.fileURL),
+           let fileURLs = pasteboard.readObjects(forClasses: [NSURL.self], options: nil) as? [URL],
            !fileURLs.isEmpty,
            fileURLs.allSatisfy({ $0.isFileURL }) {
             return .fileURLs(fileURLs)
         }
         
         // Check for rich text
-        if let rtfData = pasteboard.data(forType: .rtf),
+        if types.contains(.rtf),
+           let rtfData = pasteboard.data(forType: .rtf),
            let attributedString = NSAttributedString(rtf: rtfData, documentAttributes: nil) {
             return .richText(attributedString)
         }
         
         // Check for HTML
-        if let htmlData = pasteboard.data(forType: .html),
+        if types.contains(.html),
+           let htmlData = pasteboard.data(forType: .html),
            let attributedString = NSAttributedString(html: htmlData, documentAttributes: nil) {
             return .richText(attributedString)
         }
         
         // Check for plain text
-        if let string = pasteboard.string(forType: .string), !string.isEmpty {
+        if var string, !string.isEmpty {
+            // Pasteboard strings arrive as bridged UTF-16 NSStrings; native UTF-8
+            // storage is smaller for typical text and faster to hash and search
+            string.makeContiguousUTF8()
             return .text(string)
         }
         
         return nil
     }
     
+    /// Decodes the pasteboard image, handing back the previous NSImage when the
+    /// bytes are unchanged so identical copies never decode or encode again
+    private func readImage(_ rawImage: PasteboardPayload?, digest knownDigest: Int?) -> NSImage? {
+        guard let rawImage else {
+            return NSImage(pasteboard: pasteboard)
+        }
+        
+        // Only the digest is kept so large payloads are not pinned in memory
+        let digest = knownDigest ?? Self.digest(of: [rawImage])
+        if digest == lastImageDigest, let lastImage {
+            return lastImage
+        }
+        
+        // NSImage(data:) keeps the compressed bytes and only decodes pixels when drawn
+        guard let image = NSImage(data: rawImage.data) else { return nil }
+        image.payloadDigest = digest
+        lastImageDigest = digest
+        lastImage = image
+        return image
+    }
+    
+    /// Raw bytes of the preferred image flavor
+    private func rawImage(types: [NSPasteboard.PasteboardType]) -> PasteboardPayload? {
+        guard let type = Self.rawImageTypes.first(where: types.contains) else { return nil }
+        return pasteboard.data(forType: type).map { (data: $0, type: type) }
+    }
+    
+    /// Hashes a large image off the main actor, then publishes it from the main actor unless
+    /// the digest shows it repeats the last capture. The image keeps the compressed pasteboard
+    /// bytes in memory and decodes them when drawn. Its digest is what later fingerprint
+    /// matches are confirmed against.
+    private func captureLargeImage(
+        _ payload: PasteboardPayload,
+        confirming fingerprint: PasteboardFingerprint,
+        unlessDigest repeatedDigest: Int?
+    ) {
+        imageTask = Task { [weak self] in
+            let digest = await Task.detached(priority: .userInitiated) {
+                ClipboardMonitor.digest(of: [payload])
+            }.value
+            
+            guard let self, !Task.isCancelled else { return }
+            self.imageTask = nil
+            if fingerprint == self.lastFingerprint {
+                self.lastPayloadDigest = digest
+            }
+            if digest == repeatedDigest {
+                return
+            }
+            
+            if digest == self.lastImageDigest, let lastImage = self.lastImage {
+                self.onClipboardChange?(.image(lastImage))
+                return
+            }
+            
+            guard let image = NSImage(data: payload.data) else { return }
+            image.payloadDigest = digest
+            self.lastImageDigest = digest
+            self.lastImage = image
+            self.onClipboardChange?(.image(image))
+        }
+    }
+    
+    /// Identifies captured payloads for dedup within this process; nothing here needs a
+    /// cryptographic hash. Flavor boundaries are already pinned down by the fingerprint.
+    private nonisolated static func digest(of payloads: [PasteboardPayload]) -> Int {
+        var hasher = Hasher()
+        for payload in payloads {
+            payload.data.withUnsafeBytes { hasher.combine(bytes: $0) }
+        }
+        return hasher.finalize()
+    }
+    
     func writeToClipboard(_ content: ClipboardContent) {
         pasteboard.clearContents()
         
@@ -129,5 +307,37 @@ class ClipboardMonitor {
         }
         
         lastChangeCount = pasteboard.changeCount
+        lastFingerprint = nil
+        lastPayloadDigest = nil
+    }
+}
+
+/// A pasteboard flavor's raw bytes together with the flavor they were read from
+private typealias PasteboardPayload = (data: Data, type: NSPasteboard.PasteboardType)
+
+/// Cheap summary of a pasteboard snapshot: its flavor list, plus the length and a hash
+/// of the first and last few kilobytes of each captured flavor. Equal fingerprints only
+/// suggest equal content; a full digest has to confirm them.
+private struct PasteboardFingerprint: Equatable {
+    private static let sampleSize = 4096
+    
+    let types: [NSPasteboard.PasteboardType]
+    let lengths: [Int]
+    let sample: Int
+    
+    init(types: [NSPasteboard.PasteboardType], payloads: [PasteboardPayload]) {
+        var hasher = Hasher()
+        for (data, _) in payloads {
+            if data.count > 2 * Self.sampleSize {
+                data.prefix(Self.sampleSize).withUnsafeBytes { hasher.combine(bytes: $0) }
+                data.suffix(Self.sampleSize).withUnsafeBytes { hasher.combine(bytes: $0) }
+            } else {
+                data.withUnsafeBytes { hasher.combine(bytes: $0) }
+            }
+        }
+        
+        self.types = types
+        self.lengths = payloads.map { $0.data.count }
+        self.sample = hasher.finalize()
     }
 }
@@ -1,15 +1,23 @@
 import Foundation
 @preconcurrency import Carbon
 import AppKit
+import os
+
+private let logger = Logger(subsystem: "com.kliply", category: "Hotkey")
 
 /// Manages global hotkey registration and events
 @MainActor
 class HotkeyManager {
     private var eventHandler: EventHandlerRef?
     private var hotKeyRef: EventHotKeyRef?
-    private let hotkeyID = EventHotKeyID(signature: OSType(0x4B4C5059), id: 1) // 'KLPY'
+    nonisolated private static let hotkeyID = EventHotKeyID(signature: OSType(0x4B4C5059), id: 1) // 'KLPY'
+    
+    /// Presses closer together than this are treated as one, so a held or bounced combo toggles once
+    private static let debounceInterval: TimeInterval = 0.25
+    private var lastPressUptime: TimeInterval = 0
     
-    var onHotkeyPressed: (() -> Void)?
+    /// Invoked on the main actor straight from the Carbon event handler
+    var onHotkeyPressed: (@MainActor () -> Void)?
     
     init() {}
     
@@ -17,73 +25,91 @@ class HotkeyManager {
         // Unregister existing hotkey first
         unregisterHotkey()
         
-        // Install event handler
-        var eventType = EventTypeSpec(eventClass: OSType(kEventClassKeyboard), eventKind: UInt32(kEventHotKeyPressed))
-        let status = InstallEventHandler(
-            GetApplicationEventTarget(),
-            { (_, event, userData) -> OSStatus in
-                guard let userData = userData else { return OSStatus(eventNotHandledErr) }
-                let manager = Unmanaged<HotkeyManager>.fromOpaque(userData).takeUnretainedValue()
-                
-                var eventID = EventHotKeyID()
-                GetEventParameter(
-                    event,
-                    EventParamName(kEventParamDirectObject),
-                    EventParamType(typeEventHotKeyID),
-                    nil,
-                    MemoryLayout<EventHotKeyID>.size,
-                    nil,
-                    &eventID
-                )
-                
-                if eventID.id == manager.hotkeyID.id {
-                    DispatchQueue.main.async {
-                        manager.onHotkeyPressed?()
-                    }
-                    return noErr
-                }
-                
-                return OSStatus(eventNotHandledErr)
-            },
-            1,
-            &eventType,
-            Unmanaged.passUnretained(self).toOpaque(),
-            &eventHandler
-        )
-        
-        guard status == noErr else {
-            print("Failed to install event handler: \(status)")
-            return false
-        }
+        guard installEventHandler() else { return false }
         
         // Register the hotkey
         let registerStatus = RegisterEventHotKey(
             keyCode,
             modifiers,
-            hotkeyID,
+            Self.hotkeyID,
             GetApplicationEventTarget(),
             0,
             &hotKeyRef
         )
         
         guard registerStatus == noErr else {
-            print("Failed to register hotkey: \(registerStatus)")
+            logger.error("Failed to register hotkey: \(registerStatus)")
+            return false
+        }
+        
+        return true
+    }
+    
+    /// Carbon callback for our hot key; it captures nothing and reaches the manager through user data
+    nonisolated private static let eventHandlerCallback: EventHandlerUPP = { _, event, userData in
+        // Reject anything that is not our hot key on the ID alone, before touching the manager
+        var eventID = EventHotKeyID()
+        let status = GetEventParameter(
+            event,
+            EventParamName(kEventParamDirectObject),
+            EventParamType(typeEventHotKeyID),
+            nil,
+            MemoryLayout<EventHotKeyID>.size,
+            nil,
+            &eventID
+        )
+        guard status == noErr,
+              eventID.signature == HotkeyManager.hotkeyID.signature,
+              eventID.id == HotkeyManager.hotkeyID.id,
+              let userData = userData else {
+            return OSStatus(eventNotHandledErr)
+        }
+        
+        let manager = Unmanaged<HotkeyManager>.fromOpaque(userData).takeUnretainedValue()
+        // Application event target handlers are dispatched on the main thread
+        MainActor.assumeIsolated {
+            guard manager.acceptPress() else { return }
+            manager.onHotkeyPressed?()
+        }
+        return noErr
+    }
+    
+    /// Installs the hot key handler once; later registrations only swap the hot key itself
+    private func installEventHandler() -> Bool {
+        guard eventHandler == nil else { return true }
+        
+        var eventType = EventTypeSpec(eventClass: OSType(kEventClassKeyboard), eventKind: UInt32(kEventHotKeyPressed))
+        let status = InstallEventHandler(
+            GetApplicationEventTarget(),
+            Self.eventHandlerCallback,
+            1,
+            &eventType,
+            Unmanaged.passUnretained(self).toOpaque(),
+            &eventHandler
+        )
+        
+        guard status == noErr else {
+            logger.error("Failed to install event handler: \(status)")
             return false
         }
         
         return true
     }
     
+    /// Records a press and reports whether it came far enough after the previous one
+    private func acceptPress() -> Bool {
+        let now = ProcessInfo.processInfo.systemUptime
+        guard now - lastPressUptime >= Self.debounceInterval else { return false }
+        lastPressUptime = now
+        return true
+    }
+    
     func unregisterHotkey() {
+        // The event handler stays installed; it only ever sees our own hot key ID
         if let hotKeyRef = hotKeyRef {
             UnregisterEventHotKey(hotKeyRef)
             self.hotKeyRef = nil
         }
-        
-        if let eventHandler = eventHandler {
-            RemoveEventHandler(eventHandler)
-            self.eventHandler = nil
-        }
     }
     
     nonisolated func checkAccessibilityPermissions() -> Bool {
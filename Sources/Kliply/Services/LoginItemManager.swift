@@ -1,5 +1,8 @@
 import Foundation
 import ServiceManagement
+import os
+
+private let logger = Logger(subsystem: "com.kliply", category: "LoginItem")
 
 /// Manages the app's login item status
 @MainActor
@@ -48,7 +51,7 @@ class LoginItemManager {
                 print("⚠️ Login item operation not permitted in current environment")
                 #endif
             } else {
-                print("⚠️ Could not update login item status: \(error.localizedDescription)")
+                logger.error("Could not update login item status: \(error.localizedDescription, privacy: .public)")
             }
         }
     }
@@ -1,5 +1,8 @@
 import Foundation
 import AppKit
+import os
+
+private let logger = Logger(subsystem: "com.kliply", category: "URLMetadata")
 
 /// Service to fetch URL metadata for preview
 actor URLMetadataFetcher {
@@ -22,29 +25,32 @@ actor URLMetadataFetcher {
         
         do {
             let (data, _) = try await URLSession.shared.data(from: url)
-            if let html = String(data: data, encoding: .utf8) {
+            // The title sits in the head, so the body is never decoded or scanned
+            let head = data.range(of: Self.headEnd).map { data[..<$0.lowerBound] } ?? data
+            if let html = String(data: head, encoding: .utf8) {
                 let title = extractTitle(from: html)
                 cache[url] = title
                 return title
             }
         } catch {
-            print("Failed to fetch URL metadata: \(error)")
+            logger.error("Failed to fetch URL metadata: \(error.localizedDescription, privacy: .public)")
         }
         
         return nil
     }
     
+    private static let headEnd = Data("</head>".utf8)
+    
+    /// Compiled once and shared by every lookup
+    private static let titleRegex = try! NSRegularExpression(pattern: "<title>([^<]+)</title>", options: .caseInsensitive)
+    
     private func extractTitle(from html: String) -> String? {
-        // Simple regex to extract <title> tag
-        let pattern = "<title>([^<]+)</title>"
-        if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive) {
-            let nsString = html as NSString
-            if let match = regex.firstMatch(in: html, range: NSRange(location: 0, length: nsString.length)) {
-                if match.numberOfRanges > 1 {
-                    let titleRange = match.range(at: 1)
-                    return nsString.substring(with: titleRange)
-                        .trimmingCharacters(in: .whitespacesAndNewlines)
-                }
+        let nsString = html as NSString
+        if let match = Self.titleRegex.firstMatch(in: html, range: NSRange(location: 0, length: nsString.length)) {
+            if match.numberOfRanges > 1 {
+                let titleRange = match.range(at: 1)
+                return nsString.substring(with: titleRange)
+                    .trimmingCharacters(in: .whitespacesAndNewlines)
             }
         }
         return nil
@@ -4,7 +4,7 @@ import SwiftUI
 /// Main application state manager
 @Observable
 @MainActor
-class AppState {
+final class AppState {
     static let shared = AppState()
     
     // Services
@@ -13,19 +13,33 @@ class AppState {
     private let settings = AppSettings.shared
     
     // State
-    var clipboardHistory: [ClipboardItem] = []
+    var clipboardHistory: [ClipboardItem] = [] {
+        didSet { filteredCache = nil }
+    }
     var isPopupVisible: Bool = false
+    /// When the popup was last shown; the reused popup view reads it so every show re-renders
+    var popupShownAt: Date = .now
     var isAccessibilityPermissionGranted: Bool = false
     var selectedItemIndex: Int = 0
-    var searchQuery: String = ""
-    var selectedFilter: ContentFilter = .all
+    var searchQuery: String = "" {
+        didSet { filteredCache = nil }
+    }
+    var selectedFilter: ContentFilter = .all {
+        didSet { filteredCache = nil }
+    }
     var showSettings: Bool = false
     private var previousApp: NSRunningApplication?
     private var isPasting: Bool = false
     
+    /// Last result of `filteredHistory`, cleared whenever one of its inputs changes
+    @ObservationIgnored private var filteredCache: [ClipboardItem]?
+    
+    /// Sandboxing cannot change while the process runs, so the environment is read once
+    private static let sandboxed = ProcessInfo.processInfo.environment["APP_SANDBOX_CONTAINER_ID"] != nil
+    
     /// Whether the app is running in a sandboxed environment
     var isSandboxed: Bool {
-        return ProcessInfo.processInfo.environment["APP_SANDBOX_CONTAINER_ID"] != nil
+        return Self.sandboxed
     }
     
     /// Whether auto-paste functionality is available
@@ -35,44 +49,26 @@ class AppState {
     
     init() {
         self.clipboardMonitor = ClipboardMonitor(appSettings: settings)
+        // Size storage for a full history up front; the extra slot covers the insert before a trim
+        clipboardHistory.reserveCapacity(settings.historyDepth + 1)
         setupClipboardMonitor()
         setupHotkeyManager()
     }
     
     // Computed
     var filteredHistory: [ClipboardItem] {
-        var items = clipboardHistory
+        // Read every input before the cache so views keep observing them on a hit
+        let history = clipboardHistory
+        let filter = selectedFilter
+        let query = searchQuery
+        if let filteredCache { return filteredCache }
         
-        // Apply filter
-        if selectedFilter != .all {
-            items = items.filter { item in
-                switch selectedFilter {
-                case .text:
-                    if case .text = item.content { return true }
-                    if case .richText = item.content { return true }
-                    return false
-                case .images:
-                    if case .image = item.content { return true }
-                    return false
-                case .urls:
-                    if case .url = item.content { return true }
-                    return false
-                case .files:
-                    if case .fileURLs = item.content { return true }
-                    return false
-                case .all:
-                    return true
-                }
-            }
+        // Apply filter and search in a single pass
+        let items = filter == .all && query.isEmpty ? history : history.filter { item in
+            filter.matches(item.content) &&
+                (query.isEmpty || item.previewText.localizedCaseInsensitiveContains(query))
         }
-        
-        // Apply search
-        if !searchQuery.isEmpty {
-            items = items.filter { item in
-                item.content.previewText.localizedCaseInsensitiveContains(searchQuery)
-            }
-        }
-        
+        filteredCache = items
         return items
     }
     
@@ -86,15 +82,13 @@ class AppState {
             // Register hotkey without accessibility permission (allowed)
             registerHotkey()
         } else {
-            // Check permissions for non-sandboxed builds
-            isAccessibilityPermissionGranted = hotkeyManager.isPermissionGranted()
+            // Check permissions for non-sandboxed builds; the same query shows the
+            // permission prompt when access has not been granted yet
+            isAccessibilityPermissionGranted = hotkeyManager.checkAccessibilityPermissions()
             
             if !isAccessibilityPermissionGranted {
-                // This will trigger the permission prompt
-                _ = hotkeyManager.checkAccessibilityPermissions()
-                
-                // Start polling for permission grant
-                startPermissionPolling()
+                // Wait for the user to grant it in System Settings
+                startPermissionMonitoring()
             } else {
                 registerHotkey()
             }
@@ -107,41 +101,38 @@ class AppState {
     func stop() {
         clipboardMonitor.stopMonitoring()
         hotkeyManager.unregisterHotkey()
+        stopPermissionMonitoring()
     }
     
     private func setupClipboardMonitor() {
         clipboardMonitor.onClipboardChange = { [weak self] content in
             guard let self = self, let content = content else { return }
-            Task { @MainActor in
-                self.addToHistory(content: content)
-            }
+            self.addToHistory(content: content)
         }
     }
     
     private func setupHotkeyManager() {
         hotkeyManager.onHotkeyPressed = { [weak self] in
-            Task { @MainActor in
-                guard let self = self else { return }
-                // Store the currently active app BEFORE opening popup
-                let workspace = NSWorkspace.shared
-                let frontmost = workspace.frontmostApplication
+            guard let self = self else { return }
+            // Store the currently active app BEFORE opening popup
+            let workspace = NSWorkspace.shared
+            let frontmost = workspace.frontmostApplication
+            #if DEBUG
+            print("=== HOTKEY PRESSED ===")
+            print("Frontmost app: \(frontmost?.localizedName ?? "nil")")
+            print("Frontmost bundle: \(frontmost?.bundleIdentifier ?? "nil")")
+            print("Our bundle: \(Bundle.main.bundleIdentifier ?? "nil")")
+            #endif
+            
+            // Only store if it's not Kliply itself
+            if let frontmost = frontmost, frontmost.bundleIdentifier != Bundle.main.bundleIdentifier {
+                self.previousApp = frontmost
                 #if DEBUG
-                print("=== HOTKEY PRESSED ===")
-                print("Frontmost app: \(frontmost?.localizedName ?? "nil")")
-                print("Frontmost bundle: \(frontmost?.bundleIdentifier ?? "nil")")
-                print("Our bundle: \(Bundle.main.bundleIdentifier ?? "nil")")
+                print("Stored previous app: \(self.previousApp?.localizedName ?? "nil")")
                 #endif
-                
-                // Only store if it's not Kliply itself
-                if let frontmost = frontmost, frontmost.bundleIdentifier != Bundle.main.bundleIdentifier {
-                    self.previousApp = frontmost
-                    #if DEBUG
-                    print("Stored previous app: \(self.previousApp?.localizedName ?? "nil")")
-                    #endif
-                }
-                
-                self.togglePopup()
             }
+            
+            self.togglePopup()
         }
     }
     
@@ -163,11 +154,16 @@ class AppState {
     /// Update the hotkey registration with current settings
     /// Called when user changes the hotkey in settings
     func updateHotkey() {
-        hotkeyManager.unregisterHotkey()
+        // registerHotkey releases the previous hot key itself
         registerHotkey()
     }
     
-    private var permissionTimer: Timer?
+    private var permissionObserver: NSObjectProtocol?
+    private var permissionActivationObserver: NSObjectProtocol?
+    private var permissionBackstopTimer: Timer?
+    private var isPermissionCheckPending = false
+    /// The trust broadcast is undocumented, so a slow poll still catches a grant it misses
+    private static let permissionBackstopInterval: TimeInterval = 10
         /// Temporarily disable the global hotkey (used during rebind capture)
         func suspendHotkey() {
             // Only relevant outside sandbox
@@ -179,47 +175,120 @@ class AppState {
         func resumeHotkey() {
             // Only relevant outside sandbox
             guard !isSandboxed else { return }
-            _ = hotkeyManager.registerHotkey(
-                keyCode: settings.hotkeyKeyCode,
-                modifiers: settings.hotkeyModifiers
-            )
+            registerHotkey()
         }
     
-    private func startPermissionPolling() {
-        permissionTimer = Timer.scheduledTimer(withTimeInterval: 1.0, repeats: true) { [weak self] _ in
-            guard let self = self else { return }
-            
-            Task { @MainActor [weak self] in
-                guard let self = self else { return }
-                
-                if self.hotkeyManager.isPermissionGranted() {
-                    self.isAccessibilityPermissionGranted = true
-                    self.registerHotkey()
-                    self.stopPermissionPolling()
-                }
+    /// Listens for the system's accessibility trust broadcast instead of waking up on a fast timer.
+    /// Activation and a slow, coalescable timer back it up in case the broadcast never arrives.
+    private func startPermissionMonitoring() {
+        guard permissionObserver == nil else { return }
+        
+        permissionObserver = DistributedNotificationCenter.default().addObserver(
+            forName: NSNotification.Name("com.apple.accessibility.api"),
+            object: nil,
+            queue: .main
+        ) { [weak self] _ in
+            MainActor.assumeIsolated {
+                self?.schedulePermissionCheck()
             }
         }
+        
+        // Users usually come back to Kliply right after granting access in System Settings
+        permissionActivationObserver = NotificationCenter.default.addObserver(
+            forName: NSApplication.didBecomeActiveNotification,
+            object: nil,
+            queue: .main
+        ) { [weak self] _ in
+            MainActor.assumeIsolated {
+                self?.schedulePermissionCheck()
+            }
+        }
+        
+        permissionBackstopTimer = Timer.scheduledTimer(
+            withTimeInterval: Self.permissionBackstopInterval,
+            repeats: true
+        ) { [weak self] _ in
+            MainActor.assumeIsolated {
+                self?.schedulePermissionCheck()
+            }
+        }
+        // Nothing depends on when exactly this fires, so let the system batch it freely
+        permissionBackstopTimer?.tolerance = Self.permissionBackstopInterval / 2
+    }
+    
+    /// Broadcasts come in bursts while the user toggles the switch; they share one check
+    private func schedulePermissionCheck() {
+        guard !isPermissionCheckPending else { return }
+        isPermissionCheckPending = true
+        
+        // The broadcast can land just before the trust database is updated
+        DispatchQueue.main.asyncAfter(deadline: .now() + 0.5) { [weak self] in
+            self?.checkPermissionGranted()
+        }
     }
     
-    private func stopPermissionPolling() {
-        permissionTimer?.invalidate()
-        permissionTimer = nil
+    private func checkPermissionGranted() {
+        isPermissionCheckPending = false
+        guard hotkeyManager.isPermissionGranted() else { return }
+        
+        isAccessibilityPermissionGranted = true
+        registerHotkey()
+        stopPermissionMonitoring()
+    }
+    
+    private func stopPermissionMonitoring() {
+        if let permissionObserver {
+            DistributedNotificationCenter.default().removeObserver(permissionObserver)
+            self.permissionObserver = nil
+        }
+        if let permissionActivationObserver {
+            NotificationCenter.default.removeObserver(permissionActivationObserver)
+            self.permissionActivationObserver = nil
+        }
+        permissionBackstopTimer?.invalidate()
+        permissionBackstopTimer = nil
     }
     
     func addToHistory(content: ClipboardContent) {
-        let newItem = ClipboardItem(content: content)
+        var newItem = ClipboardItem(content: content)
         
-        // Skip if it's a duplicate of the most recent item
-        if let lastItem = clipboardHistory.first, lastItem.content == content {
-            return
+        // A duplicate anywhere in history is moved to the top rather than stored twice.
+        // History holds at most 100 items and the stored hashes are compared first, so a scan is cheap.
+        let existingIndex = clipboardHistory.firstIndex(where: { $0.isDuplicate(of: newItem) })
+        let isRichText: Bool
+        if case .richText = content { isRichText = true } else { isRichText = false }
+        
+        // Skip if it's a duplicate of the most recent item. Rich text matches on visible
+        // text only, so it is still replaced to keep the latest formatting for pasting.
+        if existingIndex == 0, !isRichText { return }
+        
+        // The cached filter result can share history's buffer; drop it first so the
+        // mutations below happen in place instead of copying into a new buffer
+        filteredCache = nil
+        
+        if let existingIndex {
+            if isRichText {
+                clipboardHistory.remove(at: existingIndex)
+            } else {
+                // Keep the stored payload so the copy just read can be released
+                newItem = clipboardHistory.remove(at: existingIndex).refreshed()
+            }
         }
         
         clipboardHistory.insert(newItem, at: 0)
         
-        // Trim to history depth
-        if clipboardHistory.count > settings.historyDepth {
-            clipboardHistory.removeLast(clipboardHistory.count - settings.historyDepth)
-        }
+        trimHistory()
+    }
+    
+    /// Drops the oldest entries in place once history exceeds the configured depth
+    /// Called after each insert and when the user lowers the depth in settings
+    func trimHistory() {
+        let overflow = clipboardHistory.count - settings.historyDepth
+        guard overflow > 0 else { return }
+        
+        // Keep the buffer uniquely referenced so the removal happens in place
+        filteredCache = nil
+        clipboardHistory.removeLast(overflow)
     }
     
     func togglePopup() {
@@ -228,16 +297,14 @@ class AppState {
         if isPopupVisible {
             selectedItemIndex = 0
             searchQuery = ""
+            popupShownAt = .now
         }
     }
     
     /// Close popup - window close and focus restoration happens in AppDelegate.hidePopup()
     func closePopup() {
-        // Close the popup
+        // AppDelegate observes isPopupVisible and hides the window
         isPopupVisible = false
-        
-        // Notify AppDelegate to close window and restore focus
-        NotificationCenter.default.post(name: Notification.Name("hidePopup"), object: nil)
     }
     
     func storePreviousAppAndToggle(_ app: NSRunningApplication?) {
@@ -287,7 +354,7 @@ class AppState {
         }
         let item = filteredHistory[index]
         #if DEBUG
-        print("Selected item: \(item.content.previewText.prefix(50))")
+        print("Selected item: \(item.previewText.prefix(50))")
         #endif
         
         // Write to clipboard
@@ -303,7 +370,6 @@ class AppState {
         
         // Close popup - focus restoration happens in hidePopup
         isPopupVisible = false
-        NotificationCenter.default.post(name: Notification.Name("hidePopup"), object: nil)
         #if DEBUG
         print("Popup closed, will paste: \(shouldPaste)")
         #endif
@@ -327,63 +393,120 @@ class AppState {
     }
     
     func clearHistory() {
-        clipboardHistory.removeAll()
+        // Drop the cached filter result first so the kept capacity is not a fresh copy
+        filteredCache = nil
+        clipboardHistory.removeAll(keepingCapacity: true)
+        clipboardMonitor.forgetLastCapture()
     }
     
     func removeItem(at index: Int) {
         guard index < clipboardHistory.count else { return }
+        filteredCache = nil
         clipboardHistory.remove(at: index)
+        clipboardMonitor.forgetLastCapture()
     }
     
+    /// Event source for synthesized pastes, created once rather than per paste
+    private static let pasteEventSource = CGEventSource(stateID: .hidSystemState)
+    /// Virtual key code of 'V'
+    private static let vKeyCode: CGKeyCode = 0x09
+    /// Longest wait for the previous app to come forward before pasting anyway
+    private static let pasteActivationTimeout: TimeInterval = 0.5
+    /// Pause after activation so the app can restore its key window before Cmd+V arrives
+    private static let pasteSettleDelay: TimeInterval = 0.05
+    private var pasteActivationObserver: NSObjectProtocol?
+    private var pasteTimeout: DispatchWorkItem?
+    private var pasteSettle: DispatchWorkItem?
+    
     private func simulatePaste() {
         // Prevent multiple simultaneous paste operations
         guard !isPasting else {
             return
         }
         
+        // Without a previous app there is nowhere to paste
+        guard let prevApp = previousApp else { return }
+        
         isPasting = true
         #if DEBUG
         print("simulatePaste: Starting paste sequence")
+        print("simulatePaste: Activating \(prevApp.localizedName ?? "unknown") (bundle: \(prevApp.bundleIdentifier ?? "nil"))")
         #endif
         
-        // If we have a previous app, activate it first
-        if let prevApp = previousApp {
-            #if DEBUG
-            print("simulatePaste: Activating \(prevApp.localizedName ?? "unknown") (bundle: \(prevApp.bundleIdentifier ?? "nil"))")
-            #endif
-            
-            // Use activate to bring app to foreground
-            prevApp.activate()
-            
-            // Wait longer for activation and window focus, then paste using CGEvent
-            DispatchQueue.main.asyncAfter(deadline: .now() + 0.5) { [weak self] in
-                #if DEBUG
-                print("simulatePaste: Executing paste command")
-                let currentFrontmost = NSWorkspace.shared.frontmostApplication
-                print("simulatePaste: Current frontmost app: \(currentFrontmost?.localizedName ?? "nil")")
-                #endif
-                
-                // Use CGEvent to simulate Cmd+V (more reliable than AppleScript)
-                let source = CGEventSource(stateID: .hidSystemState)
-                
-                // Key code 0x09 is 'V'
-                let keyVDown = CGEvent(keyboardEventSource: source, virtualKey: 0x09, keyDown: true)
-                keyVDown?.flags = .maskCommand
-                keyVDown?.post(tap: .cghidEventTap)
-                
-                let keyVUp = CGEvent(keyboardEventSource: source, virtualKey: 0x09, keyDown: false)
-                keyVUp?.flags = .maskCommand
-                keyVUp?.post(tap: .cghidEventTap)
-                #if DEBUG
-                print("Paste command sent via CGEvent")
-                #endif
-                
-                // Reset pasting flag
-                self?.isPasting = false
+        // Paste shortly after the app reports it is active instead of always waiting
+        let pid = prevApp.processIdentifier
+        pasteActivationObserver = NSWorkspace.shared.notificationCenter.addObserver(
+            forName: NSWorkspace.didActivateApplicationNotification,
+            object: nil,
+            queue: .main
+        ) { [weak self] notification in
+            let app = notification.userInfo?[NSWorkspace.applicationUserInfoKey] as? NSRunningApplication
+            guard app?.processIdentifier == pid else { return }
+            MainActor.assumeIsolated {
+                self?.settlePaste(into: pid)
             }
-        } else {
-            isPasting = false
         }
+        
+        // Use activate to bring app to foreground
+        prevApp.activate()
+        
+        // Paste anyway if the activation notification never arrives
+        let timeout = DispatchWorkItem { [weak self] in
+            MainActor.assumeIsolated {
+                self?.postPaste()
+            }
+        }
+        pasteTimeout = timeout
+        DispatchQueue.main.asyncAfter(deadline: .now() + Self.pasteActivationTimeout, execute: timeout)
+    }
+    
+    /// The activation notification can arrive before the app has restored its key window,
+    /// so paste after a short settle and only once the app is really frontmost
+    private func settlePaste(into pid: pid_t) {
+        pasteSettle?.cancel()
+        let settle = DispatchWorkItem { [weak self] in
+            MainActor.assumeIsolated {
+                // Otherwise the activation timeout still pastes
+                guard NSWorkspace.shared.frontmostApplication?.processIdentifier == pid else { return }
+                self?.postPaste()
+            }
+        }
+        pasteSettle = settle
+        DispatchQueue.main.asyncAfter(deadline: .now() + Self.pasteSettleDelay, execute: settle)
+    }
+    
+    /// Sends Cmd+V once per paste sequence, whichever of the settled activation or the timeout comes first
+    private func postPaste() {
+        guard isPasting else { return }
+        isPasting = false
+        
+        // A stale timeout or settle must not fire into a later paste sequence
+        pasteTimeout?.cancel()
+        pasteTimeout = nil
+        pasteSettle?.cancel()
+        pasteSettle = nil
+        if let pasteActivationObserver {
+            NSWorkspace.shared.notificationCenter.removeObserver(pasteActivationObserver)
+            self.pasteActivationObserver = nil
+        }
+        
+        #if DEBUG
+        print("simulatePaste: Executing paste command")
+        let currentFrontmost = NSWorkspace.shared.frontmostApplication
+        print("simulatePaste: Current frontmost app: \(currentFrontmost?.localizedName ?? "nil")")
+        #endif
+        
+        // Use CGEvent to simulate Cmd+V (more reliable than AppleScript)
+        let keyVDown = CGEvent(keyboardEventSource: Self.pasteEventSource, virtualKey: Self.vKeyCode, keyDown: true)
+        keyVDown?.flags = .maskCommand
+        keyVDown?.post(tap: .cghidEventTap)
+        
+        let keyVUp = CGEvent(keyboardEventSource: Self.pasteEventSource, virtualKey: Self.vKeyCode, keyDown: false)
+        keyVUp?.flags = .maskCommand
+        keyVUp?.post(tap: .cghidEventTap)
+        #if DEBUG
+        print("Paste command sent via CGEvent")
+        #endif
     }
 }
 
@@ -393,4 +516,14 @@ enum ContentFilter: String, CaseIterable {
     case images = "Images"
     case urls = "URLs"
     case files = "Files"
+    
+    /// Whether content of this kind is shown under the filter
+    func matches(_ content: ClipboardContent) -> Bool {
+        switch (self, content) {
+        case (.all, _), (.text, .text), (.text, .richText), (.images, .image), (.urls, .url), (.files, .fileURLs):
+            return true
+        default:
+            return false
+        }
+    }
 }
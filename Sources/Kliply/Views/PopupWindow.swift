@@ -5,6 +5,12 @@ struct PopupWindow: View {
     @FocusState private var isSearchFocused: Bool
     
     var body: some View {
+        // Filter once per render; every row below reads this snapshot
+        let history = appState.filteredHistory
+        // Timestamps are relative to when the popup was shown. Reading this keeps the
+        // persistent hosting view from showing times left over from the last show.
+        let now = appState.popupShownAt
+        
         VStack(spacing: 0) {
             // Header with search and filters
             VStack(spacing: 12) {
@@ -69,24 +75,33 @@ struct PopupWindow: View {
             Divider()
             
             // History list
-            if appState.filteredHistory.isEmpty {
+            if history.isEmpty {
                 EmptyHistoryView()
             } else {
-                ScrollView {
-                    LazyVStack(spacing: 0) {
-                        ForEach(Array(appState.filteredHistory.enumerated()), id: \.element.id) { index, item in
-                            ClipboardItemRow(
-                                item: item,
-                                isSelected: appState.selectedItemIndex == index,
-                                action: { appState.selectItem(at: index) },
-                                onDelete: { appState.removeItem(at: index) }
-                            )
-                            
-                            if index < appState.filteredHistory.count - 1 {
-                                Divider()
+                ScrollViewReader { proxy in
+                    ScrollView {
+                        LazyVStack(spacing: 0) {
+                            ForEach(Array(history.enumerated()), id: \.element.id) { index, item in
+                                ClipboardItemRow(
+                                    item: item,
+                                    now: now,
+                                    isSelected: appState.selectedItemIndex == index,
+                                    action: { appState.selectItem(at: index) },
+                                    onDelete: { appState.removeItem(at: index) }
+                                )
+                                
+                                if index < history.count - 1 {
+                                    Divider()
+                                }
                             }
                         }
                     }
+                    .onChange(of: appState.isPopupVisible) { _, isVisible in
+                        // The window is reused, so each showing starts at the newest item
+                        if isVisible, let first = history.first {
+                            proxy.scrollTo(first.id, anchor: .top)
+                        }
+                    }
                 }
             }
             
@@ -98,8 +113,6 @@ struct PopupWindow: View {
                 Spacer()
                 KeyboardShortcutHint(key: "↩", description: "Select")
                 Spacer()
-                KeyboardShortcutHint(key: "⇧↩", description: "Alt Format")
-                Spacer()
                 KeyboardShortcutHint(key: "⌘,", description: "Settings")
                 Spacer()
                 KeyboardShortcutHint(key: "⎋", description: "Close")
@@ -118,8 +131,9 @@ struct PopupWindow: View {
             return .handled
         }
         .onKeyPress(.downArrow) {
-            if !appState.filteredHistory.isEmpty {
-                appState.selectedItemIndex = min(appState.filteredHistory.count - 1, appState.selectedItemIndex + 1)
+            let count = appState.filteredHistory.count
+            if count > 0 {
+                appState.selectedItemIndex = min(count - 1, appState.selectedItemIndex + 1)
             }
             return .handled
         }
@@ -168,6 +182,7 @@ struct FilterPill: View {
 
 struct ClipboardItemRow: View {
     let item: ClipboardItem
+    let now: Date
     let isSelected: Bool
     let action: () -> Void
     let onDelete: () -> Void
@@ -182,7 +197,7 @@ struct ClipboardItemRow: View {
             
             // Content preview
             VStack(alignment: .leading, spacing: 4) {
-                Text(item.content.previewText)
+                Text(item.previewText)
                     .lineLimit(3)
                     .font(.body)
                 
@@ -229,7 +244,7 @@ struct ClipboardItemRow: View {
     }
     
     private func relativeTime(from date: Date) -> String {
-        let seconds = Date.now.timeIntervalSince(date)
+        let seconds = now.timeIntervalSince(date)
         
         if seconds < 60 {
             return "Just now"
@@ -5,7 +5,6 @@ import Carbon.HIToolbox
 struct SettingsView: View {
     @Environment(AppSettings.self) private var settings
     @Environment(\.dismiss) private var dismiss
-    @State private var windowMonitor: NSObjectProtocol?
     
     var body: some View {
         TabView {
@@ -31,11 +30,8 @@ struct SettingsView: View {
         }
         .frame(width: 500, height: 500)
         .onAppear {
+            // Later activations are floated by the app delegate's didBecomeKey observer
             bringWindowToFront()
-            setupWindowMonitoring()
-        }
-        .onDisappear {
-            removeWindowMonitoring()
         }
     }
     
@@ -51,57 +47,34 @@ struct SettingsView: View {
             }
         }
     }
-    
-    private func setupWindowMonitoring() {
-        // Monitor when the window becomes key (focused) again
-        windowMonitor = NotificationCenter.default.addObserver(
-            forName: NSWindow.didBecomeKeyNotification,
-            object: nil,
-            queue: .main
-        ) { notification in
-            guard let window = notification.object as? NSWindow else { return }
-            
-            // Check if this is a Settings window
-            Task { @MainActor in
-                if window.title.contains("Settings") || window.isKeyWindow {
-                    // Bring the window to front
-                    DispatchQueue.main.asyncAfter(deadline: .now() + 0.1) {
-                        NSApp.activate(ignoringOtherApps: true)
-                        window.makeKeyAndOrderFront(nil)
-                        window.level = .floating
-                    }
-                }
-            }
-        }
-    }
-    
-    private func removeWindowMonitoring() {
-        if let monitor = windowMonitor {
-            NotificationCenter.default.removeObserver(monitor)
-        }
-    }
 }
 
 struct GeneralSettingsView: View {
     @Environment(AppSettings.self) private var settings
     
+    private var historyDepth: Binding<Int> {
+        Binding(
+            get: { settings.historyDepth },
+            set: {
+                // The field and stepper re-send the current value; skip the no-op write and trim
+                guard $0 != settings.historyDepth else { return }
+                settings.historyDepth = $0
+                AppState.shared.trimHistory()
+            }
+        )
+    }
+    
     var body: some View {
         Form {
             Section {
                 HStack {
                     Text("History Depth:")
                     Spacer()
-                    TextField("", value: Binding(
-                        get: { settings.historyDepth },
-                        set: { settings.historyDepth = $0 }
-                    ), format: .number)
+                    TextField("", value: historyDepth, format: .number)
                     .frame(width: 60)
                     .textFieldStyle(.roundedBorder)
                     
-                    Stepper("", value: Binding(
-                        get: { settings.historyDepth },
-                        set: { settings.historyDepth = $0 }
-                    ), in: 1...100)
+                    Stepper("", value: historyDepth, in: 1...100)
                     .labelsHidden()
                 }
                 
@@ -159,9 +132,23 @@ struct HotkeySettingsView: View {
     @State private var localMonitor: Any?
     @State private var didCapture = false
     
+    /// Key codes of the modifier keys themselves (Command, Shift, Caps Lock, Option, Control, Fn)
+    private static let modifierKeyCodes: Set<UInt16> = [54, 55, 56, 57, 58, 59, 60, 61, 62, 63]
+    /// Modifiers a shortcut can be built from
+    private static let hotkeyModifierMask: NSEvent.ModifierFlags = [.command, .option, .control, .shift]
+    /// Each shortcut modifier paired with its Carbon mask
+    private static let carbonModifiers: [(flag: NSEvent.ModifierFlags, mask: UInt32)] = [
+        (.command, UInt32(cmdKey)),
+        (.option, UInt32(optionKey)),
+        (.control, UInt32(controlKey)),
+        (.shift, UInt32(shiftKey))
+    ]
+    /// Keyboard Shortcuts pane of System Settings, where the Services shortcut is assigned
+    private static let keyboardSettingsURL = URL(string: "x-apple.systempreferences:com.apple.Keyboard-Settings.extension")!
+    
     /// Whether the app is running in sandbox mode
     private var isSandboxed: Bool {
-        ProcessInfo.processInfo.environment["APP_SANDBOX_CONTAINER_ID"] != nil
+        AppState.shared.isSandboxed
     }
     
     var body: some View {
@@ -329,8 +316,8 @@ struct HotkeySettingsView: View {
     }
     
     private func handleKeyEvent(_ event: NSEvent) {
-        // Get normalized modifiers
-        let modifiers = event.modifierFlags.intersection(.deviceIndependentFlagsMask)
+        // Mask down to the shortcut modifiers in one step
+        let modifiers = event.modifierFlags.intersection(Self.hotkeyModifierMask)
         // Must include at least one modifier
         guard hasRequiredModifiers(modifiers) else { return }
         
@@ -354,25 +341,17 @@ struct HotkeySettingsView: View {
     
     // MARK: - Hotkey helpers
     private func hasRequiredModifiers(_ modifiers: NSEvent.ModifierFlags) -> Bool {
-        return modifiers.contains(.command)
-            || modifiers.contains(.option)
-            || modifiers.contains(.control)
-            || modifiers.contains(.shift)
+        !modifiers.isDisjoint(with: Self.hotkeyModifierMask)
     }
     
     private func isOnlyModifierKey(_ keyCode: UInt16) -> Bool {
-        // Common modifier-only key codes
-        let modifierKeyCodes: Set<UInt16> = [54, 55, 56, 57, 58, 59, 60, 61, 62, 63]
-        return modifierKeyCodes.contains(keyCode)
+        Self.modifierKeyCodes.contains(keyCode)
     }
     
     private func toCarbonModifiers(_ flags: NSEvent.ModifierFlags) -> UInt32 {
-        var result: UInt32 = 0
-        if flags.contains(.command) { result |= UInt32(cmdKey) }
-        if flags.contains(.option) { result |= UInt32(optionKey) }
-        if flags.contains(.control) { result |= UInt32(controlKey) }
-        if flags.contains(.shift) { result |= UInt32(shiftKey) }
-        return result
+        Self.carbonModifiers.reduce(0) { result, modifier in
+            flags.contains(modifier.flag) ? result | modifier.mask : result
+        }
     }
     
     private func resetToDefault() {
@@ -385,9 +364,7 @@ struct HotkeySettingsView: View {
     }
     
     private func openKeyboardSettings() {
-        if let url = URL(string: "x-apple.systempreferences:com.apple.Keyboard-Settings.extension") {
-            NSWorkspace.shared.open(url)
-        }
+        NSWorkspace.shared.open(Self.keyboardSettingsURL)
     }
 }
 
@@ -22,6 +22,34 @@ final class ClipboardItemTests: XCTestCase {
         XCTAssertEqual(item1, item2)
     }
     
+    func testDedupHashMatchesForEqualContent() {
+        let item1 = ClipboardItem(content: .text("Same"))
+        let item2 = ClipboardItem(content: .text("Same"))
+        let item3 = ClipboardItem(content: .text("Other"))
+        
+        XCTAssertEqual(item1.dedupHash, item2.dedupHash)
+        XCTAssertNotEqual(item1, item3)
+    }
+    
+    func testCanonicallyEquivalentTextIsOneEntry() {
+        // Finder hands out decomposed (NFD) names; they look the same as precomposed text
+        let precomposed = ClipboardContent.text("caf\u{E9}")
+        let decomposed = ClipboardContent.text("cafe\u{301}")
+        
+        XCTAssertEqual(precomposed, decomposed)
+        XCTAssertEqual(precomposed.hashValue, decomposed.hashValue)
+    }
+    
+    func testRichTextEqualityKeepsFormatting() {
+        let plain = ClipboardContent.richText(NSAttributedString(string: "Paragraph"))
+        let bold = ClipboardContent.richText(NSAttributedString(string: "Paragraph", attributes: [.font: NSFont.boldSystemFont(ofSize: 12)]))
+        
+        // Formatting matters for equality; only dedup looks at the visible text
+        XCTAssertNotEqual(plain, bold)
+        XCTAssertEqual(plain.dedupKey, bold.dedupKey)
+        XCTAssertTrue(ClipboardItem(content: plain).isDuplicate(of: ClipboardItem(content: bold)))
+    }
+    
     func testDisplayType() {
         XCTAssertEqual(ClipboardContent.text("test").displayType, "Text")
         XCTAssertEqual(ClipboardContent.richText(NSAttributedString(string: "test")).displayType, "Rich Text")
@@ -39,6 +67,13 @@ final class ClipboardItemTests: XCTestCase {
         XCTAssertEqual(urlContentNoTitle.previewText, "https://example.com")
     }
     
+    func testPreviewTextStoredOnItem() {
+        let item = ClipboardItem(content: .text("  Stored preview\n"))
+        
+        XCTAssertEqual(item.previewText, "Stored preview")
+        XCTAssertEqual(item.refreshed().previewText, "Stored preview")
+    }
+    
     func testFileURLsPreview() {
         let urls = [
             URL(fileURLWithPath: "/path/to/file1.txt"),
@@ -80,6 +115,28 @@ final class AppSettingsTests: XCTestCase {
         XCTAssertTrue(description.contains("V"))
     }
     
+    @MainActor
+    func testHotkeyDescriptionNamesAnyLetter() {
+        let settings = AppSettings.shared
+        let originalKeyCode = settings.hotkeyKeyCode
+        defer { settings.hotkeyKeyCode = originalKeyCode }
+        
+        settings.hotkeyKeyCode = 40 // kVK_ANSI_K
+        XCTAssertTrue(settings.hotkeyDescription.hasSuffix("K"))
+    }
+    
+    @MainActor
+    func testExcludedAppMatchingIgnoresCase() {
+        let settings = AppSettings.shared
+        settings.addExcludedApp("Com.Example.Vault")
+        defer { settings.removeExcludedApp("Com.Example.Vault") }
+        
+        XCTAssertTrue(settings.isAppExcluded(bundleIdentifier: "com.example.vault"))
+        
+        settings.removeExcludedApp("Com.Example.Vault")
+        XCTAssertFalse(settings.isAppExcluded(bundleIdentifier: "com.example.vault"))
+    }
+    
     @MainActor
     func testLaunchAtLoginDefaultsToTrue() {
         let settings = AppSettings.shared
@@ -113,6 +170,58 @@ final class AppStateTests: XCTestCase {
         XCTAssertEqual(appState.clipboardHistory.count, 1)
     }
     
+    func testNonConsecutiveDuplicateMovesToTop() {
+        let appState = AppState.shared
+        appState.clearHistory()
+        
+        appState.addToHistory(content: .text("First"))
+        appState.addToHistory(content: .text("Second"))
+        appState.addToHistory(content: .text("First")) // Duplicate further down
+        
+        XCTAssertEqual(appState.clipboardHistory.count, 2)
+        XCTAssertEqual(appState.clipboardHistory[0].content, .text("First"))
+        XCTAssertEqual(appState.clipboardHistory[1].content, .text("Second"))
+    }
+    
+    func testSameSizeImagesDeduplicatedByPayload() {
+        let appState = AppState.shared
+        appState.clearHistory()
+        
+        // Same-size screenshots that differ only in their bytes, as the monitor tags them
+        func screenshot(digest: Int) -> NSImage {
+            let image = NSImage(size: NSSize(width: 100, height: 100))
+            image.payloadDigest = digest
+            return image
+        }
+        appState.addToHistory(content: .image(screenshot(digest: 1)))
+        appState.addToHistory(content: .image(screenshot(digest: 2)))
+        appState.addToHistory(content: .image(screenshot(digest: 1)))
+        
+        XCTAssertEqual(appState.clipboardHistory.count, 2)
+        guard case .image(let top) = appState.clipboardHistory[0].content,
+              case .image(let second) = appState.clipboardHistory[1].content else {
+            return XCTFail("Expected image content")
+        }
+        XCTAssertEqual(top.payloadDigest, 1)
+        XCTAssertEqual(second.payloadDigest, 2)
+    }
+    
+    func testRichTextDuplicateKeepsLatestFormatting() {
+        let appState = AppState.shared
+        appState.clearHistory()
+        
+        let plain = NSAttributedString(string: "Paragraph")
+        let bold = NSAttributedString(string: "Paragraph", attributes: [.font: NSFont.boldSystemFont(ofSize: 12)])
+        appState.addToHistory(content: .richText(plain))
+        appState.addToHistory(content: .richText(bold))
+        
+        XCTAssertEqual(appState.clipboardHistory.count, 1)
+        guard case .richText(let stored) = appState.clipboardHistory[0].content else {
+            return XCTFail("Expected rich text content")
+        }
+        XCTAssertTrue(stored.isEqual(to: bold))
+    }
+    
     func testHistoryDepthLimit() {
         let appState = AppState.shared
         let settings = AppSettings.shared
@@ -130,6 +239,25 @@ final class AppStateTests: XCTestCase {
         XCTAssertEqual(appState.clipboardHistory[2].content, .text("Item 3"))
     }
     
+    func testTrimHistoryAfterLoweringDepth() {
+        let appState = AppState.shared
+        let settings = AppSettings.shared
+        
+        appState.clearHistory()
+        settings.historyDepth = 5
+        
+        for i in 1...5 {
+            appState.addToHistory(content: .text("Item \(i)"))
+        }
+        
+        settings.historyDepth = 2
+        appState.trimHistory()
+        
+        XCTAssertEqual(appState.clipboardHistory.count, 2)
+        XCTAssertEqual(appState.clipboardHistory[0].content, .text("Item 5"))
+        XCTAssertEqual(appState.clipboardHistory[1].content, .text("Item 4"))
+    }
+    
     func testClearHistory() {
         let appState = AppState.shared
         appState.clipboardHistory.removeAll()
@@ -182,6 +310,32 @@ final class AppStateTests: XCTestCase {
         appState.searchQuery = ""
         XCTAssertEqual(appState.filteredHistory.count, 3)
     }
+    
+    func testFilteredHistoryRefreshesAfterEachInputChanges() {
+        let appState = AppState.shared
+        appState.clipboardHistory.removeAll()
+        appState.searchQuery = ""
+        appState.selectedFilter = .all
+        
+        appState.addToHistory(content: .text("Hello World"))
+        XCTAssertEqual(appState.filteredHistory.map(\.content), [.text("Hello World")])
+        
+        // New history must not be served from the cached result
+        appState.addToHistory(content: .url(URL(string: "https://example.com")!, title: nil))
+        XCTAssertEqual(appState.filteredHistory.count, 2)
+        
+        appState.searchQuery = "Hello"
+        XCTAssertEqual(appState.filteredHistory.map(\.content), [.text("Hello World")])
+        
+        appState.searchQuery = ""
+        appState.selectedFilter = .urls
+        XCTAssertEqual(
+            appState.filteredHistory.map(\.content),
+            [.url(URL(string: "https://example.com")!, title: nil)]
+        )
+        
+        appState.selectedFilter = .all
+    }
 }
 
 final class ClipboardMonitorTests: XCTestCase {
@@ -229,6 +383,67 @@ final class ClipboardMonitorTests: XCTestCase {
             XCTFail("Expected URL content")
         }
     }
+    
+    @MainActor
+    func testSameLengthPayloadsWithMatchingEndsAreBothCaptured() {
+        let monitor = ClipboardMonitor()
+        var captured: [ClipboardContent?] = []
+        monitor.onClipboardChange = { captured.append($0) }
+        
+        // Same length, same first and last few kilobytes, different middle
+        let padding = String(repeating: "x", count: 10_000)
+        let first = padding + "A" + padding
+        let second = padding + "B" + padding
+        
+        NSPasteboard.general.clearContents()
+        NSPasteboard.general.setString(first, forType: .string)
+        monitor.checkClipboard()
+        
+        NSPasteboard.general.clearContents()
+        NSPasteboard.general.setString(second, forType: .string)
+        monitor.checkClipboard()
+        
+        XCTAssertEqual(captured, [.text(first), .text(second)])
+    }
+    
+    @MainActor
+    func testCopiesSharingLeadingMarkerFlavorAreBothCaptured() {
+        let monitor = ClipboardMonitor()
+        var captured: [ClipboardContent?] = []
+        monitor.onClipboardChange = { captured.append($0) }
+        
+        // Source apps often lead with an identical marker flavor before the content
+        let marker = NSPasteboard.PasteboardType("org.nspasteboard.source")
+        for text in ["First copy", "Second copy"] {
+            NSPasteboard.general.declareTypes([marker, .string], owner: nil)
+            NSPasteboard.general.setString("com.example.editor", forType: marker)
+            NSPasteboard.general.setString(text, forType: .string)
+            monitor.checkClipboard()
+        }
+        
+        XCTAssertEqual(captured, [.text("First copy"), .text("Second copy")])
+    }
+    
+    @MainActor
+    func testIdenticalRecopyIsSkippedUntilCaptureIsReset() {
+        let monitor = ClipboardMonitor()
+        var captured: [ClipboardContent?] = []
+        monitor.onClipboardChange = { captured.append($0) }
+        
+        for _ in 0..<2 {
+            NSPasteboard.general.clearContents()
+            NSPasteboard.general.setString("Same text", forType: .string)
+            monitor.checkClipboard()
+        }
+        XCTAssertEqual(captured, [.text("Same text")])
+        
+        // clearHistory and removeItem reset the monitor so the same copy is captured again
+        monitor.forgetLastCapture()
+        NSPasteboard.general.clearContents()
+        NSPasteboard.general.setString("Same text", forType: .string)
+        monitor.checkClipboard()
+        XCTAssertEqual(captured, [.text("Same text"), .text("Same text")])
+    }
 }
 
 @MainActor